@@ -1,4 +1,6 @@
 import re
+import sys
+from functools import reduce
 
 import awkward
 import dask_awkward
@@ -19,6 +21,8 @@ def _checkConsistency(against, tocheck):
     return tocheck
 
 
+_namere = re.compile("([^_]*)_([^_]*)_([^_]*)_([^_]*)_([^_]*)")
+
 _levelre = re.compile("Resolution")
 
 
@@ -31,6 +35,13 @@ def _getLevel(levelName):
 
 _level_order = ["Resolution"]
 
+_array_types = (dask_awkward.Array, awkward.highlevel.Array, numpy.ndarray)
+
+
+def _sorting_key(name_and_func):
+    this_level = _getLevel(name_and_func[0])
+    return _level_order.index(this_level)
+
 
 class JetResolution:
     """
@@ -54,12 +65,8 @@ class JetResolution:
         You construct a JetResolution by passing in a dict of names and functions.
         Names must be formatted as '<campaign>_<dataera>_<datatype>_<level>_<jettype>'.
         """
-        jettype = None
-        levels = []
+        infos = []
         funcs = []
-        datatype = None
-        campaign = None
-        dataera = None
         for name, func in kwargs.items():
             if not isinstance(func, jme_standard_function):
                 raise Exception(
@@ -67,16 +74,17 @@ class JetResolution:
                         name, type(func)
                     )
                 )
-            info = name.split("_")
-            if len(info) != 5:
+            match = _namere.fullmatch(name)
+            if match is None:
                 raise Exception("Corrector name is not properly formatted!")
-
-            campaign = _checkConsistency(campaign, info[0])
-            dataera = _checkConsistency(dataera, info[1])
-            datatype = _checkConsistency(datatype, info[2])
-            levels.append(info[3])
+            infos.append(match.groups())
             funcs.append(func)
-            jettype = _checkConsistency(jettype, info[4])
+
+        campaign = reduce(_checkConsistency, (info[0] for info in infos), None)
+        dataera = reduce(_checkConsistency, (info[1] for info in infos), None)
+        datatype = reduce(_checkConsistency, (info[2] for info in infos), None)
+        levels = [info[3] for info in infos]
+        jettype = reduce(_checkConsistency, (info[4] for info in infos), None)
 
         if campaign is None:
             raise Exception("Unable to determine production campaign of JECs!")
@@ -104,18 +112,9 @@ class JetResolution:
         else:
             self._jettype = jettype
 
-        for i, level in enumerate(self._levels):
-            this_level = _getLevel(level)
-            ord_idx = _level_order.index(this_level)
-            if i != this_level:
-                self._levels[i], self._levels[ord_idx] = (
-                    self._levels[ord_idx],
-                    self._levels[i],
-                )
-                self._funcs[i], self._funcs[ord_idx] = (
-                    self._funcs[ord_idx],
-                    self._funcs[i],
-                )
+        temp = list(zip(*sorted(zip(self._levels, self._funcs), key=_sorting_key)))
+        self._levels = list(temp[0])
+        self._funcs = list(temp[1])
 
         # now we setup the call signature for this factorized JEC
         self._signature = []
@@ -125,6 +124,15 @@ class JetResolution:
                 if input not in self._signature:
                     self._signature.append(input)
 
+        # per-level signatures and dask labels are fixed from here on
+        self._func_sigs = [tuple(func.signature) for func in self._funcs]
+        self._dask_labels = tuple(
+            sys.intern(
+                f"{self._campaign}_{self._dataera}_{self._datatype}_{level}_{self._jettype}"
+            )
+            for level in self._levels
+        )
+
     @property
     def signature(self):
         """list the necessary jet properties that must be input to this function"""
@@ -148,21 +156,10 @@ class JetResolution:
             jrs = reso.getResolution(JetProperty1=jet.property1,...)
 
         """
-        resos = []
-        for i, func in enumerate(self._funcs):
-            sig = func.signature
-            args = tuple(kwargs[inp] for inp in sig)
-
-            if isinstance(
-                args[0], (dask_awkward.Array, awkward.highlevel.Array, numpy.ndarray)
-            ):
-                resos.append(
-                    func(
-                        *args,
-                        dask_label=f"{self._campaign}_{self._dataera}_{self._datatype}_{self._levels[i]}_{self._jettype}",
-                    )
-                )
-            else:
-                raise Exception("Unknown array library for inputs.")
+        func = self._funcs[-1]
+        args = tuple(kwargs[inp] for inp in self._func_sigs[-1])
+
+        if not isinstance(args[0], _array_types):
+            raise Exception("Unknown array library for inputs.")
 
-        return resos[-1]
+        return func(*args, dask_label=self._dask_labels[-1])
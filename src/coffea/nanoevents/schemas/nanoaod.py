@@ -124,7 +124,11 @@ class NanoAODSchema(BaseSchema):
         "Jet_muonIdxG": ["Jet_muonIdx1G", "Jet_muonIdx2G"],
         "Jet_electronIdxG": ["Jet_electronIdx1G", "Jet_electronIdx2G"],
     }
-    """Nested collections, where nesting is accomplished by a fixed-length set of indexers"""
+    """Nested collections, where nesting is accomplished by a fixed-length set of indexers
+
+    The nested indexer has a regular inner dimension, e.g. ``FatJet.subJetIdxG``
+    is of type ``var * 2 * int64`` (it was ``var * var * int64`` in earlier versions)
+    """
     nested_index_items = {
         "Jet_pFCandsIdxG": ("Jet_nConstituents", "JetPFCands"),
         "FatJet_pFCandsIdxG": ("FatJet_nConstituents", "FatJetPFCands"),
@@ -14,7 +14,14 @@ def to_layout(array):
 
 
 def ensure_array(arraylike):
-    if isinstance(arraylike, (awkward.contents.Content, awkward.Array)):
+    if isinstance(arraylike, awkward.Array):
+        arraylike = arraylike.layout
+    if isinstance(arraylike, awkward.contents.NumpyArray) and isinstance(
+        arraylike.data, numpy.ndarray
+    ):
+        # the common case: skip the general-purpose awkward.to_numpy dispatch
+        return arraylike.data
+    if isinstance(arraylike, awkward.contents.Content):
         return awkward.to_numpy(arraylike)
     elif isinstance(arraylike, awkward.index.Index):
         return arraylike.data
@@ -108,7 +115,7 @@ def counts2offsets(stack):
     counts = ensure_array(stack.pop())
     offsets = numpy.empty(len(counts) + 1, dtype=numpy.int64)
     offsets[0] = 0
-    numpy.cumsum(counts, out=offsets[1:])
+    numpy.cumsum(counts, dtype=numpy.int64, out=offsets[1:])
     stack.append(offsets)
 
 
@@ -126,6 +133,22 @@ def local2global_form(index, target_offsets):
     return form
 
 
+@numba.njit(cache=True, boundscheck=False)
+def _local2global_kernel(index_offsets, index_content, target_offsets):
+    base = index_offsets[0]
+    out = numpy.empty(index_offsets[-1] - base, dtype=numpy.int64)
+    for record_index in range(len(index_offsets) - 1):
+        start_tgt = target_offsets[record_index]
+        stop_tgt = target_offsets[record_index + 1]
+        for i in range(index_offsets[record_index], index_offsets[record_index + 1]):
+            local = index_content[i]
+            if local < 0 or local + start_tgt >= stop_tgt:
+                out[i - base] = -1
+            else:
+                out[i - base] = local + start_tgt
+    return out
+
+
 def local2global(stack):
     """Turn jagged local index into global index
 
@@ -133,12 +156,13 @@ def local2global(stack):
     Outputs a content array with same shape as index content
     """
     target_offsets = ensure_array(stack.pop())
-    index = stack.pop()
-    index = index.mask[index >= 0] + target_offsets[:-1]
-    index = index.mask[index < target_offsets[1:]]
-    out = ensure_array(awkward.flatten(awkward.fill_none(index, -1), axis=None))
-    if out.dtype != numpy.int64:
-        raise RuntimeError
+    index = to_layout(stack.pop()).to_ListOffsetArray64(False)
+    if len(index.offsets) != len(target_offsets):
+        raise RuntimeError("index and target have different lengths!")
+    content = ensure_array(index.content)
+    if not numpy.issubdtype(content.dtype, numpy.integer):
+        raise RuntimeError("local index is not an integer array!")
+    out = _local2global_kernel(index.offsets.data, content, target_offsets)
     stack.append(out)
 
 
@@ -170,16 +194,23 @@ def counts2nestedindex(stack):
     Signature: local_counts,target_offsets,!counts2nestedindex
     Outputs a jagged array with same axis-0 shape as counts axis-1
     """
-    target_offsets = stack.pop()
-    local_counts = stack.pop()
-    out = awkward.unflatten(
-        numpy.arange(target_offsets[-1], dtype=numpy.int64),
-        awkward.flatten(local_counts),
+    target_length = ensure_array(stack.pop())[-1]
+    local_counts = ensure_array(awkward.flatten(stack.pop()))
+    offsets = numpy.empty(len(local_counts) + 1, dtype=numpy.int64)
+    offsets[0] = 0
+    numpy.cumsum(local_counts, dtype=numpy.int64, out=offsets[1:])
+    if offsets[-1] != target_length:
+        raise RuntimeError("local counts do not add up to the target length!")
+    out = awkward.Array(
+        awkward.contents.ListOffsetArray(
+            awkward.index.Index64(offsets),
+            awkward.contents.NumpyArray(numpy.arange(target_length, dtype=numpy.int64)),
+        )
     )
     stack.append(out)
 
 
-@numba.njit
+@numba.njit(cache=True, boundscheck=False)
 def _distinctParent_kernel(allpart_parent, allpart_pdg):
     out = numpy.empty(len(allpart_pdg), dtype=numpy.int64)
     for i in range(len(allpart_pdg)):
@@ -189,8 +220,6 @@ def _distinctParent_kernel(allpart_parent, allpart_pdg):
             continue
         thispdg = allpart_pdg[i]
         while parent >= 0 and allpart_pdg[parent] == thispdg:
-            if parent >= len(allpart_pdg):
-                raise RuntimeError("parent index beyond length of array!")
             parent = allpart_parent[parent]
         out[i] = parent
     return out
@@ -226,33 +255,52 @@ def distinctParent(stack):
     Signature: globalparents,globalpdgs,!distinctParent
     Expects global indexes, flat arrays, which should be same length
     """
-    pdg = stack.pop()
-    parents = stack.pop()
-    stack.append(_distinctParent_kernel(awkward.Array(parents), awkward.Array(pdg)))
+    pdg = ensure_array(stack.pop())
+    parents = ensure_array(stack.pop())
+    if len(parents) != len(pdg):
+        raise RuntimeError("parents and pdg ids have different lengths!")
+    if len(parents) > 0 and parents.max() >= len(pdg):
+        raise RuntimeError("parent index beyond length of array!")
+    stack.append(_distinctParent_kernel(parents, pdg))
 
 
-@numba.njit
+@numba.njit(cache=True, boundscheck=False)
 def _children_kernel(offsets_in, parentidx):
     offsets1_out = numpy.empty(len(parentidx) + 1, dtype=numpy.int64)
     content1_out = numpy.empty(len(parentidx), dtype=numpy.int64)
+    # per-particle child count, then per-particle write position
+    cursor = numpy.empty(len(parentidx), dtype=numpy.int64)
     offsets1_out[0] = 0
 
-    offset0 = 1
+    if offsets_in[0] < 0 or offsets_in[-1] > len(parentidx):
+        raise RuntimeError("offsets go beyond length of parent array!")
+
+    offset0 = 0
     offset1 = 0
     for record_index in range(len(offsets_in) - 1):
         start_src, stop_src = offsets_in[record_index], offsets_in[record_index + 1]
 
+        # counting sort: a child is only ever found at or after its parent
         for index in range(start_src, stop_src):
-            for possible_child in range(index, stop_src):
-                if parentidx[possible_child] == index:
-                    if offset1 >= len(content1_out):
-                        raise RuntimeError("offset1 went out of bounds!")
-                    content1_out[offset1] = possible_child
-                    offset1 = offset1 + 1
-            if offset0 >= len(offsets1_out):
-                raise RuntimeError("offset0 went out of bounds!")
-            offsets1_out[offset0] = offset1
-            offset0 = offset0 + 1
+            cursor[offset0 + index - start_src] = 0
+        for possible_child in range(start_src, stop_src):
+            parent = parentidx[possible_child]
+            if parent >= start_src and parent <= possible_child:
+                cursor[offset0 + parent - start_src] += 1
+
+        for index in range(start_src, stop_src):
+            nchildren = cursor[offset0 + index - start_src]
+            cursor[offset0 + index - start_src] = offset1
+            offset1 = offset1 + nchildren
+            offsets1_out[offset0 + index - start_src + 1] = offset1
+
+        for possible_child in range(start_src, stop_src):
+            parent = parentidx[possible_child]
+            if parent >= start_src and parent <= possible_child:
+                content1_out[cursor[offset0 + parent - start_src]] = possible_child
+                cursor[offset0 + parent - start_src] += 1
+
+        offset0 = offset0 + stop_src - start_src
 
     return offsets1_out, content1_out[:offset1]
 
@@ -287,8 +335,8 @@ def children(stack):
     Signature: offsets,globalparents,!children
     Output will be a jagged array with same outer shape as globalparents content
     """
-    parents = stack.pop()
-    offsets = stack.pop()
+    parents = ensure_array(stack.pop())
+    offsets = ensure_array(stack.pop())
     coffsets, ccontent = _children_kernel(offsets, parents)
     out = awkward.Array(
         awkward.contents.ListOffsetArray(
@@ -299,11 +347,26 @@ def children(stack):
     stack.append(out)
 
 
-@numba.njit
+@numba.njit(cache=True, boundscheck=False)
 def _distinctChildrenDeep_kernel(offsets_in, global_parents, global_pdgs):
     offsets_out = numpy.empty(len(global_parents) + 1, dtype=numpy.int64)
     content_out = numpy.empty(len(global_parents), dtype=numpy.int64)
     offsets_out[0] = 0
+    # flags for the particles in the chain of the current lookup
+    is_parent = numpy.zeros(len(global_parents), dtype=numpy.bool_)
+    has_child = numpy.zeros(len(global_parents), dtype=numpy.bool_)
+
+    if offsets_in[0] < 0 or offsets_in[-1] > len(global_parents):
+        raise RuntimeError("offsets go beyond length of parent array!")
+
+    # scratch space for the parents with same pdg id of the current lookup,
+    # a chain never holds more particles than the record it is in
+    max_record_length = 0
+    for record_index in range(len(offsets_in) - 1):
+        max_record_length = max(
+            max_record_length, offsets_in[record_index + 1] - offsets_in[record_index]
+        )
+    parents = numpy.empty(max_record_length, dtype=numpy.int64)
 
     offset0 = 1
     offset1 = 0
@@ -321,53 +384,49 @@ def _distinctChildrenDeep_kernel(offsets_in, global_parents, global_pdgs):
                 and this_pdg != global_pdgs[global_parents[index]]
             ):
                 # keep an index of parents with same pdg id
-                parents = numpy.empty(stop_src - index, dtype=numpy.int64)
                 parents[0] = index
+                is_parent[index] = True
                 offset2 = 1
 
-                # keep an additional index with parents that have at least one child
-                parents_with_children = numpy.empty(stop_src - index, dtype=numpy.int64)
-                offset3 = 0
-
                 for possible_child in range(index, stop_src):
                     possible_parent = global_parents[possible_child]
                     possibe_child_pdg = global_pdgs[possible_child]
 
-                    # compare with seen parents
-                    for parent_index in range(offset2):
-                        # check if we found a new child
-                        if parents[parent_index] == possible_parent:
-                            # first, remember that the parent has at least one child
-                            if offset3 >= len(parents_with_children):
-                                raise RuntimeError("offset3 went out of bounds!")
-                            parents_with_children[offset3] = possible_parent
-                            offset3 = offset3 + 1
-
-                            # then, depending on the pdg id, add to parents or content
-                            if possibe_child_pdg == this_pdg:
-                                # has the same pdg id, add to parents
-                                if offset2 >= len(parents):
-                                    raise RuntimeError("offset2 went out of bounds!")
-                                parents[offset2] = possible_child
-                                offset2 = offset2 + 1
-                            else:
-                                # has a different pdg id, add to content
-                                if offset1 >= len(content_out):
-                                    raise RuntimeError("offset1 went out of bounds!")
-                                content_out[offset1] = possible_child
-                                offset1 = offset1 + 1
-                            break
+                    # check if we found a new child of a seen parent
+                    if possible_parent >= 0 and is_parent[possible_parent]:
+                        # first, remember that the parent has at least one child
+                        has_child[possible_parent] = True
+
+                        # then, depending on the pdg id, add to parents or content
+                        if possibe_child_pdg == this_pdg:
+                            # has the same pdg id, add to parents
+                            if offset2 >= len(parents):
+                                raise RuntimeError("offset2 went out of bounds!")
+                            parents[offset2] = possible_child
+                            is_parent[possible_child] = True
+                            offset2 = offset2 + 1
+                        else:
+                            # has a different pdg id, add to content
+                            if offset1 >= len(content_out):
+                                raise RuntimeError("offset1 went out of bounds!")
+                            content_out[offset1] = possible_child
+                            offset1 = offset1 + 1
 
                 # add parents with same pdg id that have no children
                 for parent_index in range(1, offset2):
                     possible_child = parents[parent_index]
-                    if possible_child not in parents_with_children[:offset3]:
+                    if not has_child[possible_child]:
                         if offset1 >= len(content_out):
                             raise RuntimeError("offset1 went out of bounds! pt2")
                         content_out[offset1] = possible_child
 
                         offset1 = offset1 + 1
 
+                # reset the flags for the next lookup
+                for parent_index in range(offset2):
+                    is_parent[parents[parent_index]] = False
+                    has_child[parents[parent_index]] = False
+
             # finish this item by adding an offset
             if offset0 >= len(offsets_out):
                 raise RuntimeError("offset0 went out of bounds!")
@@ -414,13 +473,15 @@ def distinctChildrenDeep(stack):
     Signature: offsets,global_parents,global_pdgs,!distinctChildrenDeep
     Expects global indexes, flat arrays, which should be same length
     """
-    global_pdgs = stack.pop()
-    global_parents = stack.pop()
-    offsets = stack.pop()
+    global_pdgs = ensure_array(stack.pop())
+    global_parents = ensure_array(stack.pop())
+    offsets = ensure_array(stack.pop())
+    if len(global_parents) != len(global_pdgs):
+        raise RuntimeError("parents and pdg ids have different lengths!")
+    if len(global_parents) > 0 and global_parents.max() >= len(global_pdgs):
+        raise RuntimeError("parent index beyond length of array!")
     coffsets, ccontent = _distinctChildrenDeep_kernel(
-        offsets,
-        global_parents,
-        awkward.Array(global_pdgs),
+        offsets, global_parents, global_pdgs
     )
     out = awkward.Array(
         awkward.contents.ListOffsetArray(
@@ -437,7 +498,12 @@ def nestedindex_form(indices):
     form = {
         "class": "ListOffsetArray",
         "offsets": indices[0]["offsets"],
-        "content": copy.deepcopy(indices[0]),
+        "content": {
+            "class": "RegularArray",
+            "size": len(indices),
+            "content": copy.deepcopy(indices[0]["content"]),
+            "parameters": copy.deepcopy(indices[0].get("parameters", {})),
+        },
     }
     # steal offsets from first input
     key = []
@@ -456,20 +522,19 @@ def nestedindex(stack):
 
     Signature: index1,index2,...,!nestedindex
     Index arrays should all be same shape flat arrays
-    Outputs a jagged array with same outer shape as index arrays
+    Outputs a regular array with same outer shape as index arrays
     """
     indexers = stack[:]
     stack.clear()
     # return awkward.concatenate([idx[:, None] for idx in indexers], axis=1)
     n = len(indexers)
-    out = numpy.empty(n * len(indexers[0]), dtype="int64")
-    for i, idx in enumerate(indexers):
-        out[i::n] = idx
-    offsets = numpy.arange(0, len(out) + 1, n, dtype=numpy.int64)
+    out = numpy.stack([ensure_array(idx) for idx in indexers], axis=1)
+    out = out.astype(numpy.int64, copy=False).reshape(-1)
     out = awkward.Array(
-        awkward.contents.ListOffsetArray(
-            awkward.index.Index64(offsets),
+        awkward.contents.RegularArray(
             awkward.contents.NumpyArray(out),
+            n,
+            zeros_length=len(indexers[0]),
         )
     )
     stack.append(out)
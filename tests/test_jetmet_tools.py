@@ -314,6 +314,15 @@ def test_jet_resolution(optimization_enabled):
 
         print(reso)
 
+        # levels sharing the same ordering must keep their input order
+        multi_reso = JetResolution(
+            **{
+                "Spring16_25nsV10_MC_PtResolution_AK4PFPuppi": evaluator[jer_names[0]],
+                "Spring16_25nsV10_MC_EtaResolution_AK4PFPuppi": evaluator[jer_names[0]],
+            }
+        )
+        assert "levels     : PtResolution,EtaResolution\n" in repr(multi_reso)
+
         resos = reso.getResolution(JetEta=test_eta, Rho=test_Rho, JetPt=test_pt)
         resos_jag = reso.getResolution(
             JetEta=test_eta_jag, Rho=test_Rho_jag, JetPt=test_pt_jag
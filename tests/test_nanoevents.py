@@ -1,10 +1,11 @@
 from pathlib import Path
 
 import awkward as ak
+import numpy as np
 import pytest
 from distributed import Client
 
-from coffea.nanoevents import NanoAODSchema, NanoEventsFactory
+from coffea.nanoevents import NanoAODSchema, NanoEventsFactory, transforms
 
 
 def genroundtrips(genpart):
@@ -191,3 +192,82 @@ def test_missing_eventIds_warning_dask(tests_directory):
             delayed=True,
         ).events()
         events.Muon.pt.compute()
+
+
+# two records with an empty one in between, covering same pdg id chains
+# (1 -> 2 -> 3 and 9 -> 12), a self-parent (6), a parent listed after its
+# child (7) and a parent in another record (10)
+gen_offsets = np.array([0, 7, 7, 13])
+gen_parents = np.array([-1, 0, 1, 2, 3, 3, 6, 9, -1, 8, 3, 9, 9])
+gen_pdgs = np.array([21, 6, 6, 6, 5, 24, 11, 23, 2, 23, 13, 13, 23], dtype=np.int32)
+
+
+def test_transforms_children():
+    stack = [gen_offsets, gen_parents]
+    transforms.children(stack)
+    assert stack.pop().tolist() == [
+        [1],
+        [2],
+        [3],
+        [4, 5],
+        [],
+        [],
+        [6],
+        [],
+        [9],
+        [11, 12],
+        [],
+        [],
+        [],
+    ]
+
+    with pytest.raises(RuntimeError, match="offsets go beyond length"):
+        transforms.children([np.array([0, 14]), gen_parents])
+    with pytest.raises(RuntimeError, match="offsets go beyond length"):
+        transforms.children([np.array([4, 17]), gen_parents])
+
+
+def test_transforms_distinctParent():
+    # a self-parent with the same pdg id never terminates, point it at 4 instead
+    parents = gen_parents.copy()
+    parents[6] = 4
+    stack = [parents, gen_pdgs]
+    transforms.distinctParent(stack)
+    assert stack.pop().tolist() == [-1, 0, 0, 0, 3, 3, 4, 8, -1, 8, 3, 9, 8]
+
+    with pytest.raises(RuntimeError, match="different lengths"):
+        transforms.distinctParent([parents[:3], gen_pdgs])
+    parents[4] = len(parents)
+    with pytest.raises(RuntimeError, match="parent index beyond length"):
+        transforms.distinctParent([parents, gen_pdgs])
+
+
+def test_transforms_distinctChildrenDeep():
+    stack = [gen_offsets, gen_parents, gen_pdgs]
+    transforms.distinctChildrenDeep(stack)
+    assert stack.pop().tolist() == [
+        [],
+        [4, 5],
+        [],
+        [],
+        [],
+        [],
+        [],
+        [],
+        [],
+        [11, 12],
+        [],
+        [],
+        [],
+    ]
+
+    with pytest.raises(RuntimeError, match="offsets go beyond length"):
+        transforms.distinctChildrenDeep([np.array([0, 14]), gen_parents, gen_pdgs])
+    with pytest.raises(RuntimeError, match="offsets go beyond length"):
+        transforms.distinctChildrenDeep([np.array([4, 17]), gen_parents, gen_pdgs])
+    with pytest.raises(RuntimeError, match="different lengths"):
+        transforms.distinctChildrenDeep([gen_offsets, gen_parents[:3], gen_pdgs])
+    parents = gen_parents.copy()
+    parents[4] = len(parents)
+    with pytest.raises(RuntimeError, match="parent index beyond length"):
+        transforms.distinctChildrenDeep([gen_offsets, parents, gen_pdgs])
@@ -1,5 +1,6 @@
 import os
 
+import awkward as ak
 import pytest
 
 from coffea.nanoevents import NanoEventsFactory, PFNanoAODSchema
@@ -47,3 +48,26 @@ def test_nested_collections(events, field):
             return check_fields_recursive(getattr(coll, split[0]), ".".join(split[1:]))
 
     check_fields_recursive(events, field)
+
+
+@pytest.mark.parametrize("delayed", [True, False])
+def test_nested_index_type(tests_directory, delayed):
+    path = os.path.join(tests_directory, "samples/pfnano.root")
+    events = NanoEventsFactory.from_root(
+        {path: "Events"},
+        schemaclass=PFNanoAODSchema,
+        delayed=delayed,
+    ).events()
+
+    # indexers nested from a fixed set of Idx branches are regular
+    for array in (events.FatJet.subJetIdxG, events.FatJet.subjets.pt):
+        if delayed:
+            form = array.form
+            array = array.compute()
+        else:
+            form = array.layout.form
+        assert isinstance(form.content, ak.forms.RegularForm)
+        assert form.content.size == 2
+        nested = ak.type(array).content.content
+        assert isinstance(nested, ak.types.RegularType)
+        assert nested.size == 2